@@ -0,0 +1,33 @@
+import os
+import re
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+FILE_PATTERN = re.compile(r"^(\d{4})(?:-(\d{2})-(\d{2}))?\.csv$")
+
+
+def parse_filename(name: str) -> Optional[Tuple[int, int, int]]:
+	match = FILE_PATTERN.match(name)
+	if not match:
+		return None
+	year = int(match.group(1))
+	month = int(match.group(2) or 0)
+	day = int(match.group(3) or 0)
+	return year, month, day
+
+
+def sorted_record_files(root: Path) -> List[Tuple[Tuple[int, int, int], Path]]:
+	files: List[Tuple[Tuple[int, int, int], Path]] = []
+	with os.scandir(root) as entries:
+		for entry in entries:
+			name = entry.name
+			# Cheap prefilter; FILE_PATTERN only accepts .csv names anyway.
+			if not name.endswith(".csv") or not entry.is_file():
+				continue
+			parsed = parse_filename(name)
+			if parsed is None:
+				continue
+			files.append((parsed, Path(entry.path)))
+	files.sort(key=lambda item: (item[0][0], item[0][1], item[0][2], item[1].name))
+	return files
@@ -2,13 +2,15 @@
 
 import argparse
 import csv
-import re
+import functools
+import io
 import sys
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Tuple
+
+from _fpo_common import sorted_record_files
 
 
-FILE_PATTERN = re.compile(r"^(\d{4})(?:-(\d{2})-(\d{2}))?\.csv$")
 SEXES = ("M", "F")
 MALE_CLASSES = ("52", "56", "60", "67.5", "75", "82.5", "90", "100", "110", "125", "140", "SHW")
 FEMALE_CLASSES = ("44", "48", "52", "56", "60", "67.5", "75", "82.5", "90", "100", "110", "SHW")
@@ -17,6 +19,22 @@ DIVISIONS = ("Open", "Youth", "T13-15", "T16-17", "T18-19", "J20-23", "M40-44",
 LIFTS = ("S", "B", "D", "SBD")
 EVENTS = ("SBD", "B", "D")
 EQUIPMENT = ("Raw", "Wraps", "Sleeves", "Bare", "Single-ply", "Multi-ply", "Unlimited")
+# Warning kind -> (names of the values stored after the kind, message template).
+WARNING_FORMATS: Dict[str, Tuple[Tuple[str, ...], str]] = {
+	"no_files": (
+		(),
+		"⚠️  No CSV files matching pattern YYYY.csv or YYYY-MM-DD.csv were found.",
+	),
+	"unknown_key": (
+		("file", "line", "key", "name"),
+		"⚠️  Unrecognized key '{key}' in {file}:{line}{name_suffix}",
+	),
+	"non_increasing": (
+		("file", "line", "key", "weight", "prev_weight", "prev_source"),
+		"⚠️  Non-increasing record for '{key}' in {file}:{line}: "
+		"{weight} <= {prev_weight} (last set in {prev_source})",
+	),
+}
 
 
 def parse_args() -> argparse.Namespace:
@@ -32,30 +50,8 @@ def parse_args() -> argparse.Namespace:
 	return parser.parse_args()
 
 
-def parse_filename(path: Path) -> Optional[Tuple[int, int, int]]:
-	match = FILE_PATTERN.match(path.name)
-	if not match:
-		return None
-	year = int(match.group(1))
-	month = int(match.group(2) or 0)
-	day = int(match.group(3) or 0)
-	return year, month, day
-
-
-def sorted_record_files(root: Path) -> List[Tuple[Tuple[int, int, int], Path]]:
-	files: List[Tuple[Tuple[int, int, int], Path]] = []
-	for path in root.iterdir():
-		if not path.is_file():
-			continue
-		parsed = parse_filename(path)
-		if parsed is None:
-			continue
-		files.append((parsed, path))
-	files.sort(key=lambda item: (item[0][0], item[0][1], item[0][2], item[1].name))
-	return files
-
-
-def valid_keyset() -> set[str]:
+@functools.cache
+def _build_valid_keyset() -> frozenset[str]:
 	keys: set[str] = set()
 	divisions_add_tested = tuple({*DIVISIONS, *(f"{div}-D" for div in DIVISIONS)})
 
@@ -75,44 +71,52 @@ def valid_keyset() -> set[str]:
 						if invalid_bench_dead_eq or invalid_squat_total_eq:
 							continue
 						for weight in weight_classes:
-							keys.add(f"{sex}|{division}|{event}|{eq}|{weight}|{lift}")
-	return keys
+							keys.add(sys.intern(f"{sex}|{division}|{event}|{eq}|{weight}|{lift}"))
+	return frozenset(keys)
+
+
+KNOWN_KEYS = _build_valid_keyset()
 
 
 def read_rows(path: Path) -> Iterable[Tuple[int, str, float, str]]:
-	with path.open(newline="", encoding="utf-8") as handle:
-		reader = csv.reader(handle)
-		for idx, row in enumerate(reader, start=1):
-			if not row or len(row) < 2:
-				continue
-			key = row[0].strip()
-			if not key:
-				continue
-			try:
-				weight = float(row[1])
-			except ValueError:
-				print(f"⚠️  Skipping row with invalid weight in {path.name}:{idx}: {row[1]!r}")
-				continue
-			name = row[2].strip() if len(row) > 2 else ""
-			yield idx, key, weight, name
+	text = path.read_bytes().decode("utf-8")
+	rows = list(csv.reader(io.StringIO(text, newline="")))
+	for idx, row in enumerate(rows, start=1):
+		if not row or len(row) < 2:
+			continue
+		key = sys.intern(row[0].strip())
+		if not key:
+			continue
+		try:
+			weight = float(row[1])
+		except ValueError:
+			print(f"⚠️  Skipping row with invalid weight in {path.name}:{idx}: {row[1]!r}")
+			continue
+		name = sys.intern(row[2].strip()) if len(row) > 2 else ""
+		yield idx, key, weight, name
 
 
-def check_files(files: List[Tuple[Tuple[int, int, int], Path]]) -> List[str]:
-	warnings: List[str] = []
+def format_warning(warning: Tuple[object, ...]) -> str:
+	kind, *values = warning
+	field_names, template = WARNING_FORMATS[kind]
+	fields = dict(zip(field_names, values))
+	name = fields.get("name")
+	fields["name_suffix"] = f" ({name})" if name else ""
+	return template.format(**fields)
+
+
+def check_files(files: List[Tuple[Tuple[int, int, int], Path]]) -> List[Tuple[object, ...]]:
+	warnings: List[Tuple[object, ...]] = []
 	records: Dict[str, Tuple[float, str]] = {}
-	known_keys = valid_keyset()
 
 	if not files:
-		warnings.append("⚠️  No CSV files matching pattern YYYY.csv or YYYY-MM-DD.csv were found.")
+		warnings.append(("no_files",))
 		return warnings
 
 	for _file_index, (_date, path) in enumerate(files):
 		for line_no, key, weight, name in read_rows(path):
-			if key not in known_keys:
-				name_suffix = f" ({name})" if name else ""
-				warnings.append(
-					f"⚠️  Unrecognized key '{key}' in {path.name}:{line_no}{name_suffix}"
-				)
+			if key not in KNOWN_KEYS:
+				warnings.append(("unknown_key", path.name, line_no, key, name))
 			if key not in records:
 				records[key] = (weight, path.name)
 				continue
@@ -120,8 +124,7 @@ def check_files(files: List[Tuple[Tuple[int, int, int], Path]]) -> List[str]:
 			prev_weight, prev_source = records[key]
 			if weight <= prev_weight:
 				warnings.append(
-					f"⚠️  Non-increasing record for '{key}' in {path.name}:{line_no}: "
-					f"{weight} <= {prev_weight} (last set in {prev_source})"
+					("non_increasing", path.name, line_no, key, weight, prev_weight, prev_source)
 				)
 			else:
 				records[key] = (weight, path.name)
@@ -136,7 +139,7 @@ def main() -> int:
 
 	if warnings:
 		for warning in warnings:
-			print(warning)
+			print(format_warning(warning))
 		print(f"⚠️  Finished with {len(warnings)} warning(s).")
 	else:
 		print(f"✅ Checked {len(files)} file(s); no issues found.")
@@ -2,27 +2,27 @@
 
 import argparse
 import csv
-import re
+import functools
+import heapq
+import io
 import sys
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
+from _fpo_common import sorted_record_files
 
-FILE_PATTERN = re.compile(r"^(\d{4})(?:-(\d{2})-(\d{2}))?\.csv$")
 
+OPEN_DIVISIONS = frozenset({"Open", "Open-D"})
+# Stand-in for a key with no record yet. Its missing date marks the key as unseen,
+# so the placeholder weight is never compared.
+NO_RECORD: Tuple[float, Optional[date], str, bool] = (0.0, None, "", False)
 
-@dataclass
-class ParsedRow:
-	key: str
-	weight: float
-	name: str
-	location: str
 
-
-@dataclass
+@dataclass(slots=True)
 class IncreaseEvent:
 	name: str
 	key: str
@@ -32,6 +32,7 @@ class IncreaseEvent:
 	delta: float
 	previous_date: date
 	current_date: date
+	age_days: int
 	previous_has_exact_date: bool
 	previous_source_file: str
 	source_file: str
@@ -52,17 +53,16 @@ def parse_args() -> argparse.Namespace:
 		default=Path("."),
 		help="Directory containing the CSV event files (defaults to cwd).",
 	)
-	return parser.parse_args()
-
-
-def parse_filename(path: Path) -> Optional[Tuple[int, int, int]]:
-	match = FILE_PATTERN.match(path.name)
-	if not match:
-		return None
-	year = int(match.group(1))
-	month = int(match.group(2) or 0)
-	day = int(match.group(3) or 0)
-	return year, month, day
+	parser.add_argument(
+		"--jobs",
+		type=int,
+		default=1,
+		help="Number of worker processes used to parse the CSV files (defaults to 1).",
+	)
+	args = parser.parse_args()
+	if args.jobs < 1:
+		parser.error("--jobs must be at least 1")
+	return args
 
 
 def make_date(year: int, month: int, day: int) -> date:
@@ -71,131 +71,147 @@ def make_date(year: int, month: int, day: int) -> date:
 	return date(year, month, day)
 
 
-def sorted_event_files(root: Path) -> List[Tuple[Tuple[int, int, int], Path]]:
-	files: List[Tuple[Tuple[int, int, int], Path]] = []
-	for path in root.iterdir():
-		if not path.is_file():
+def read_rows(path: Path) -> Iterable[Tuple[str, float, str, str]]:
+	text = path.read_bytes().decode("utf-8")
+	rows = list(csv.reader(io.StringIO(text, newline="")))
+	for row in rows:
+		if not row or len(row) < 3:
 			continue
-		parsed = parse_filename(path)
-		if parsed is None:
+		key = sys.intern(row[0].strip())
+		try:
+			weight = float(row[1])
+		except ValueError:
 			continue
-		files.append((parsed, path))
-	files.sort(key=lambda item: (item[0][0], item[0][1], item[0][2], item[1].name))
-	return files
-
-
-def read_rows(path: Path) -> Iterable[ParsedRow]:
-	with path.open(newline="", encoding="utf-8") as handle:
-		reader = csv.reader(handle)
-		for row in reader:
-			if not row or len(row) < 3:
-				continue
-			key = row[0].strip()
-			try:
-				weight = float(row[1])
-			except ValueError:
-				continue
-			name = row[2].strip()
-			location = row[4].strip() if len(row) > 4 else ""
-			yield ParsedRow(key=key, weight=weight, name=name, location=location)
+		name = sys.intern(row[2].strip())
+		location = sys.intern(row[4].strip()) if len(row) > 4 else ""
+		yield key, weight, name, location
 
 
+@functools.cache
 def is_tested(key: str) -> bool:
-	parts = key.split("|")
-	if len(parts) < 2:
+	start = key.find("|") + 1
+	if not start:
 		return False
-	return parts[1].endswith("-D")
+	end = key.find("|", start)
+	if end < 0:
+		end = len(key)
+	return key.endswith("-D", start, end)
 
 
+@functools.cache
 def is_open_division(key: str) -> bool:
-	parts = key.split("|")
-	if len(parts) < 2:
+	start = key.find("|") + 1
+	if not start:
 		return False
-	return parts[1] in {"Open", "Open-D"}
+	end = key.find("|", start)
+	if end < 0:
+		end = len(key)
+	return key[start:end] in OPEN_DIVISIONS
+
+
+def load_rows(path: Path) -> List[Tuple[str, float, str, str]]:
+	return list(read_rows(path))
+
 
+def intern_rows(rows: Iterable[Tuple[str, float, str, str]]) -> Iterable[Tuple[str, float, str, str]]:
+	# Strings unpickled from a worker process are fresh objects, so intern them again.
+	intern = sys.intern
+	for key, weight, name, location in rows:
+		yield intern(key), weight, intern(name), intern(location)
 
-def build_report(target_year: int, root: Path) -> Dict[str, object]:
+
+def advance_records(
+	records: Dict[str, Tuple[float, date, str, bool]],
+	rows: Iterable[Tuple[str, float, str, str]],
+	current_date: date,
+	current_has_exact_date: bool,
+	source_file: str,
+) -> None:
+	get_record = records.get
+	for key, weight, _name, _location in rows:
+		prev_record = get_record(key)
+		if prev_record is None or weight > prev_record[0]:
+			records[key] = (weight, current_date, source_file, current_has_exact_date)
+
+
+def build_report(target_year: int, root: Path, jobs: int = 1) -> Dict[str, object]:
 	records: Dict[str, Tuple[float, date, str, bool]] = {}
 	total_broken = 0
 	new_records = 0
-	location_counts: Counter[str] = Counter()
-	name_counts: Counter[str] = Counter()
-	name_counts_untested: Counter[str] = Counter()
-	name_counts_tested: Counter[str] = Counter()
+	location_counts: Dict[str, int] = {}
+	name_counts: Dict[str, int] = {}
+	name_counts_untested: Dict[str, int] = {}
+	name_counts_tested: Dict[str, int] = {}
 	increase_events: List[IncreaseEvent] = []
 	open_increase_events: List[IncreaseEvent] = []
-	name_increase_totals: Counter[str] = Counter()
+	name_increase_totals: Dict[str, float] = {}
 	total_increase = 0.0
-	files = sorted_event_files(root)
-
-	for (year, month, day), path in files:
+	# Nothing after the target year can affect the report.
+	files = [item for item in sorted_record_files(root) if item[0][0] <= target_year]
+	paths = [path for _date, path in files]
+	if jobs > 1:
+		with ProcessPoolExecutor(max_workers=jobs) as executor:
+			file_rows: Iterable[Iterable[Tuple[str, float, str, str]]] = [
+				intern_rows(rows) for rows in executor.map(load_rows, paths)
+			]
+	else:
+		file_rows = (read_rows(path) for path in paths)
+
+	for ((year, month, day), path), rows in zip(files, file_rows):
 		current_date = make_date(year, month, day)
 		current_has_exact_date = bool(month and day)
-		for row in read_rows(path):
-			prev_record = records.get(row.key)
-			prev_weight = prev_record[0] if prev_record else None
-			prev_date = prev_record[1] if prev_record else None
-			prev_source_file = prev_record[2] if prev_record else ""
-			prev_has_exact_date = prev_record[3] if prev_record else False
-			is_new_best = prev_weight is None or row.weight > prev_weight
-			if is_new_best and year == target_year:
+		if year < target_year:
+			# Earlier years only establish the running best per key.
+			advance_records(records, rows, current_date, current_has_exact_date, path.name)
+			continue
+		for key, weight, name, location in rows:
+			prev_weight, prev_date, prev_source_file, prev_has_exact_date = records.get(key, NO_RECORD)
+			is_new_best = prev_date is None or weight > prev_weight
+			if is_new_best:
 				total_broken += 1
-				location_counts[row.location] += 1
-				name_counts[row.name] += 1
-				if is_tested(row.key):
-					name_counts_tested[row.name] += 1
-				if not is_tested(row.key):
-					name_counts_untested[row.name] += 1
-				if prev_weight is None:
+				location_counts[location] = location_counts.get(location, 0) + 1
+				name_counts[name] = name_counts.get(name, 0) + 1
+				if is_tested(key):
+					name_counts_tested[name] = name_counts_tested.get(name, 0) + 1
+				if not is_tested(key):
+					name_counts_untested[name] = name_counts_untested.get(name, 0) + 1
+				if prev_date is None:
 					new_records += 1
 				else:
-					delta = row.weight - prev_weight
+					delta = weight - prev_weight
 					total_increase += delta
-					name_increase_totals[row.name] += delta
-					increase_events.append(
-						IncreaseEvent(
-							name=row.name,
-							key=row.key,
-							location=row.location,
-							previous=prev_weight,
-							new=row.weight,
-							delta=delta,
-							previous_date=prev_date or current_date,
-							current_date=current_date,
-							previous_has_exact_date=prev_has_exact_date,
-							previous_source_file=prev_source_file,
-							source_file=path.name,
-						)
+					name_increase_totals[name] = name_increase_totals.get(name, 0.0) + delta
+					age_days = (current_date - prev_date).days
+					event = IncreaseEvent(
+						name=name,
+						key=key,
+						location=location,
+						previous=prev_weight,
+						new=weight,
+						delta=delta,
+						previous_date=prev_date,
+						current_date=current_date,
+						age_days=age_days,
+						previous_has_exact_date=prev_has_exact_date,
+						previous_source_file=prev_source_file,
+						source_file=path.name,
 					)
-					if is_open_division(row.key):
-						open_increase_events.append(
-							IncreaseEvent(
-								name=row.name,
-								key=row.key,
-								location=row.location,
-								previous=prev_weight,
-								new=row.weight,
-								delta=delta,
-								previous_date=prev_date or current_date,
-								current_date=current_date,
-								previous_has_exact_date=prev_has_exact_date,
-								previous_source_file=prev_source_file,
-								source_file=path.name,
-							)
-						)
+					increase_events.append(event)
+					if is_open_division(key):
+						open_increase_events.append(event)
 			if is_new_best:
-				records[row.key] = (row.weight, current_date, path.name, current_has_exact_date)
+				records[key] = (weight, current_date, path.name, current_has_exact_date)
 
 	return {
 		"total_broken": total_broken,
 		"new_records": new_records,
-		"location_counts": location_counts,
-		"name_counts": name_counts,
-		"name_counts_untested": name_counts_untested,
-		"name_counts_tested": name_counts_tested,
+		"location_counts": Counter(location_counts),
+		"name_counts": Counter(name_counts),
+		"name_counts_untested": Counter(name_counts_untested),
+		"name_counts_tested": Counter(name_counts_tested),
 		"increase_events": increase_events,
 		"open_increase_events": open_increase_events,
-		"name_increase_totals": name_increase_totals,
+		"name_increase_totals": Counter(name_increase_totals),
 		"total_increase": total_increase,
 	}
 
@@ -221,13 +237,13 @@ def format_weight_counter(counter: Counter[str], title: str, limit: int = 10) ->
 def format_increases(events: List[IncreaseEvent], limit: int = 10) -> str:
 	if not events:
 		return "Biggest glow-ups (no qualifying improvements)"
-	sorted_events = sorted(
+	top_events = heapq.nlargest(
+		limit,
 		events,
 		key=lambda item: (item.delta, item.new, item.name),
-		reverse=True,
 	)
 	lines = ["Biggest glow-ups (excluding brand new records)"]
-	for idx, event in enumerate(sorted_events[:limit], start=1):
+	for idx, event in enumerate(top_events, start=1):
 		lines.append(
 			f"{idx:2d}. {event.name} ({event.key}) +{event.delta:.1f} "
 			f"→ {event.new:.1f} at {event.location} [{event.source_file}]"
@@ -238,13 +254,13 @@ def format_increases(events: List[IncreaseEvent], limit: int = 10) -> str:
 def format_open_glowups(events: List[IncreaseEvent], limit: int = 10) -> str:
 	if not events:
 		return "Open division glow-ups (no qualifying improvements)"
-	sorted_events = sorted(
+	top_events = heapq.nlargest(
+		limit,
 		events,
 		key=lambda item: (item.delta, item.new, item.name),
-		reverse=True,
 	)
 	lines = ["Open division glow-ups (tested + untested, excluding brand new records)"]
-	for idx, event in enumerate(sorted_events[:limit], start=1):
+	for idx, event in enumerate(top_events, start=1):
 		lines.append(
 			f"{idx:2d}. {event.name} ({event.key}) +{event.delta:.1f} "
 			f"→ {event.new:.1f} at {event.location} [{event.source_file}]"
@@ -254,23 +270,17 @@ def format_open_glowups(events: List[IncreaseEvent], limit: int = 10) -> str:
 
 def format_percent_glowups(events: List[IncreaseEvent], limit: int = 10) -> str:
 	lines = ["Biggest glow-ups by % (excluding brand new records)"]
-	percent_events = [
-		(
-			(event.delta / event.previous * 100) if event.previous > 0 else 0.0,
-			event,
-		)
-		for event in events
-		if event.previous > 0
-	]
-	if not percent_events:
+	qualifying = [event for event in events if event.previous > 0]
+	if not qualifying:
 		lines.append("   (no data)")
 		return "\n".join(lines)
-	sorted_events = sorted(
-		percent_events,
-		key=lambda item: (item[0], item[1].new, item[1].name),
-		reverse=True,
+	top_events = heapq.nlargest(
+		limit,
+		qualifying,
+		key=lambda item: (item.delta / item.previous * 100, item.new, item.name),
 	)
-	for idx, (pct, event) in enumerate(sorted_events[:limit], start=1):
+	for idx, event in enumerate(top_events, start=1):
+		pct = event.delta / event.previous * 100
 		lines.append(
 			f"{idx:2d}. {event.name} ({event.key}) +{pct:.1f}% "
 			f"→ {event.new:.1f} at {event.location} [{event.source_file}]"
@@ -280,23 +290,17 @@ def format_percent_glowups(events: List[IncreaseEvent], limit: int = 10) -> str:
 
 def format_percent_open_glowups(events: List[IncreaseEvent], limit: int = 10) -> str:
 	lines = ["Open division glow-ups by % (tested + untested, excluding brand new records)"]
-	percent_events = [
-		(
-			(event.delta / event.previous * 100) if event.previous > 0 else 0.0,
-			event,
-		)
-		for event in events
-		if event.previous > 0
-	]
-	if not percent_events:
+	qualifying = [event for event in events if event.previous > 0]
+	if not qualifying:
 		lines.append("   (no data)")
 		return "\n".join(lines)
-	sorted_events = sorted(
-		percent_events,
-		key=lambda item: (item[0], item[1].new, item[1].name),
-		reverse=True,
+	top_events = heapq.nlargest(
+		limit,
+		qualifying,
+		key=lambda item: (item.delta / item.previous * 100, item.new, item.name),
 	)
-	for idx, (pct, event) in enumerate(sorted_events[:limit], start=1):
+	for idx, event in enumerate(top_events, start=1):
+		pct = event.delta / event.previous * 100
 		lines.append(
 			f"{idx:2d}. {event.name} ({event.key}) +{pct:.1f}% "
 			f"→ {event.new:.1f} at {event.location} [{event.source_file}]"
@@ -306,22 +310,17 @@ def format_percent_open_glowups(events: List[IncreaseEvent], limit: int = 10) ->
 
 def format_oldest_broken(events: List[IncreaseEvent], limit: int = 10) -> str:
 	lines = ["Oldest records finally broken"]
-	age_events = []
-	for event in events:
-		if event.previous_date:
-			age_days = (event.current_date - event.previous_date).days
-			age_events.append((age_days, event))
-	if not age_events:
+	if not events:
 		lines.append("   (no data)")
 		return "\n".join(lines)
-	sorted_events = sorted(
-		age_events,
-		key=lambda item: (item[0], item[1].new, item[1].name),
-		reverse=True,
+	top_events = heapq.nlargest(
+		limit,
+		events,
+		key=lambda item: (item.age_days, item.new, item.name),
 	)
-	for idx, (age_days, event) in enumerate(sorted_events[:limit], start=1):
+	for idx, event in enumerate(top_events, start=1):
 		if event.previous_has_exact_date:
-			age_text = f"{age_days} days"
+			age_text = f"{event.age_days} days"
 		else:
 			age_years = event.current_date.year - event.previous_date.year
 			age_text = f"{age_years} years"
@@ -334,7 +333,6 @@ def format_oldest_broken(events: List[IncreaseEvent], limit: int = 10) -> str:
 
 
 def suggest_extra_stats(report: Dict[str, object]) -> List[str]:
-	total_broken = report["total_broken"]
 	new_records = report["new_records"]
 	unique_people = len(report["name_counts"])
 	extra = [
@@ -375,7 +373,7 @@ def print_report(year: int, report: Dict[str, object]) -> None:
 
 def main() -> int:
 	args = parse_args()
-	report = build_report(args.year, args.root)
+	report = build_report(args.year, args.root, args.jobs)
 	print_report(args.year, report)
 	return 0
 